@@ -0,0 +1,71 @@
+"""Rows per second when loading listings one POST at a time vs. in bulk.
+
+Loads --rows listings three ways into a fresh database: single POST /listings
+requests (on a sample of --single-rows, extrapolated), POST /listings/batch with
+1000 creates per request, and the import-listings CLI. Usage:
+
+    python bench/bench_bulk.py [--rows 100000] [--single-rows 2000]
+"""
+import argparse
+import json
+import logging
+import time
+import warnings
+
+from common import load_app
+
+LISTING = {'title': 'Green glass bottle', 'description': 'Clean bottles', 'location': 'Paris',
+           'action': 'sell', 'material': 'glass'}
+BATCH_SIZE = 1000
+
+
+def rate(rows, fn):
+    start = time.perf_counter()
+    fn()
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--single-rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    logging.disable(logging.CRITICAL)
+    app_module, _ = load_app()
+    app = app_module.app
+    with app.app_context():
+        app_module.db.session.add(app_module.User(id=1, username='bench', email='bench@example.com',
+                                                  password_hash='x'))
+        app_module.db.session.commit()
+        headers = {'Authorization': 'Bearer ' + app_module.create_access_token(identity='1')}
+    client = app.test_client()
+
+    def single():
+        for _ in range(args.single_rows):
+            assert client.post('/listings', headers=headers, data=LISTING).status_code == 201
+
+    def batch():
+        for start in range(0, args.rows, BATCH_SIZE):
+            count = min(BATCH_SIZE, args.rows - start)
+            response = client.post('/listings/batch', headers=headers, json={'create': [LISTING] * count})
+            assert response.status_code == 200, response.data
+
+    with open('listings.ndjson', 'w') as f:
+        for _ in range(args.rows):
+            f.write(json.dumps(LISTING) + '\n')
+
+    def cli_import():
+        result = app.test_cli_runner().invoke(args=['import-listings', 'listings.ndjson', '--user', 'bench',
+                                                    '--chunk-size', str(BATCH_SIZE)])
+        assert result.exit_code == 0, result.output
+
+    single_rate = rate(args.single_rows, single)
+    print(f'single POST:            {single_rate:>8.0f} rows/s  ({args.rows:,} rows ~{args.rows / single_rate:.0f}s)')
+    print(f'batch, {BATCH_SIZE}/request:    {rate(args.rows, batch):>8.0f} rows/s')
+    print(f'import-listings, {BATCH_SIZE}: {rate(args.rows, cli_import):>8.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Listing read latency while /login is hammered.
+
+Serves the app on a local port, measures GET /listings latency when idle, then
+again while --clients threads post logins as fast as they can, and prints the
+status codes the logins got. With --inline the hashing runs on the request
+threads, as it did before the process pool, for comparison. Usage:
+
+    python bench/bench_login_storm.py [--clients 32] [--reads 200] [--inline]
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+from werkzeug.serving import make_server
+
+from common import load_app, median_ms, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--reads', type=int, default=200)
+    parser.add_argument('--inline', action='store_true', help='hash on the request threads')
+    args = parser.parse_args()
+
+    app_module, _ = load_app()
+    if args.inline:
+        app_module.run_password_task = lambda fn, *fn_args: fn(*fn_args)
+    app_module.response_cache.backend.ttl = -1  # every read hits the database
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+
+    def post(path, body):
+        req = urllib.request.Request(base + path, json.dumps(body).encode(),
+                                     {'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def reads(label, budget=60):
+        durations = []
+        deadline = time.monotonic() + budget
+        while len(durations) < args.reads and time.monotonic() < deadline:
+            start = time.perf_counter()
+            urllib.request.urlopen(base + '/listings').read()
+            durations.append(time.perf_counter() - start)
+        durations.sort()
+        print(f'{label:>5}  n={len(durations)}  p50 {median_ms(durations):.1f}ms  '
+              f'p99 {percentile(durations, 0.99) * 1000:.1f}ms', flush=True)
+
+    post('/signup', {'username': 'bench', 'email': 'bench@example.com', 'password': 'pw'})
+    reads('idle')
+
+    codes = Counter()
+    stop = threading.Event()
+
+    def storm():
+        while not stop.is_set():
+            codes[post('/login', {'username': 'bench', 'password': 'pw'})] += 1
+
+    for _ in range(args.clients):
+        threading.Thread(target=storm, daemon=True).start()
+    time.sleep(1)
+    reads('storm')
+    stop.set()
+    print('login status codes:', dict(codes))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Listing query latency as the table grows.
+
+Seeds random listings up to each size and times, through the Flask test client
+with the response cache disabled: the default feed page, a material+action
+filter, and a full-text search. For comparison it also times the old
+'%x%' ILIKE filter scan. Usage:
+
+    python bench/bench_search.py [--sizes 10000 100000 1000000] [--repeat 20]
+"""
+import argparse
+import random
+
+from common import load_app, median_ms, timed
+
+WORDS = ('green glass bottle wooden chair plastic tub copper wire cardboard box '
+         'laptop battery steel frame paper stack').split()
+MATERIALS = ('Plastic', 'Wood', 'Paper & Cardboard', 'Metal', 'Electronics', 'Glass')
+ACTIONS = ('sell', 'donate', 'exchange')
+INSERT = 'INSERT INTO listing VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+
+def seed(app_module, start, stop, rng):
+    with app_module.app.app_context():
+        connection = app_module.db.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            if start == 0:
+                cursor.execute("INSERT INTO user (id, username, email, password_hash, created_at) "
+                               "VALUES (1, 'bench', 'bench@example.com', 'x', '2024-01-01')")
+            batch = []
+            for i in range(start, stop):
+                batch.append((f'{i:036d}', ' '.join(rng.sample(WORDS, 3)), ' '.join(rng.sample(WORDS, 6)),
+                              'Paris', rng.choice(ACTIONS), rng.choice(MATERIALS), None,
+                              f'2024-01-01 00:00:00.{i:06d}', 1))
+                if len(batch) == 50000:
+                    cursor.executemany(INSERT, batch)
+                    batch = []
+            cursor.executemany(INSERT, batch)
+            connection.commit()
+        finally:
+            connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app_module, _ = load_app()
+    app_module.response_cache.backend.ttl = -1  # every request hits the database
+    client = app_module.app.test_client()
+    rng = random.Random(1)
+
+    def get(url):
+        response = client.get(url)
+        assert response.status_code == 200, response.data
+        response.close()
+
+    seeded = 0
+    for size in sorted(args.sizes):
+        seed(app_module, seeded, size, rng)
+        seeded = size
+        results = {
+            'feed page': timed(lambda: get('/listings'), args.repeat),
+            'material+action': timed(lambda: get('/listings?material=metal&action=donate'), args.repeat),
+            'q=copper wire': timed(lambda: get('/listings?q=copper+wire'), args.repeat),
+        }
+        with app_module.app.app_context():
+            old_scan = app_module.db.text(
+                "SELECT * FROM listing WHERE material LIKE '%metal%' AND action LIKE '%donate%'")
+            results['old ILIKE scan'] = timed(
+                lambda: app_module.db.session.execute(old_scan).fetchall(), min(args.repeat, 5))
+        print(f'N={size:>9,}  ' + '  '.join(f'{name} {median_ms(durations):.1f}ms'
+                                            for name, durations in results.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Memory and fan-out with many open /listings/stream subscribers.
+
+Starts the app in a child process, opens --subscribers raw SSE connections
+filtered on material=gl, publishes one listing event and reports how many
+subscribers connected and received it, and the server's RSS growth per
+connection (Linux only). Usage:
+
+    python bench/bench_sse_subscribers.py [--subscribers 1000] [--port 5099]
+"""
+import argparse
+import logging
+import resource
+import selectors
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import warnings
+
+from common import load_app
+
+
+def serve(port):
+    warnings.filterwarnings('ignore')
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app_module, _ = load_app()
+    from werkzeug.serving import make_server
+
+    @app_module.app.route('/_bench/publish')
+    def bench_publish():
+        app_module.publish_listing_event('create', {'id': 'bench', 'material': 'Glass', 'action': 'sell'})
+        return 'ok'
+
+    threading.stack_size(256 * 1024)  # one thread per open stream
+    server = make_server('127.0.0.1', port, app_module.app, threaded=True)
+    server.socket.listen(4096)
+    print('ready', flush=True)
+    server.serve_forever()
+
+
+def rss_kb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        return int(f.read().split('VmRSS:')[1].split()[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=1000)
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.port)
+
+    limit = args.subscribers + 100
+    resource.setrlimit(resource.RLIMIT_NOFILE, (limit, max(limit, resource.getrlimit(resource.RLIMIT_NOFILE)[1])))
+    server = subprocess.Popen([sys.executable, __file__, '--serve', '--port', str(args.port)],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        server.stdout.readline()
+        time.sleep(0.5)
+        base_rss = rss_kb(server.pid)
+
+        selector = selectors.DefaultSelector()
+        sockets = []
+        for _ in range(args.subscribers):
+            sock = socket.create_connection(('127.0.0.1', args.port))
+            sock.sendall(b'GET /listings/stream?material=gl HTTP/1.1\r\nHost: bench\r\n'
+                         b'Accept: text/event-stream\r\n\r\n')
+            sock.setblocking(False)
+            selector.register(sock, selectors.EVENT_READ, bytearray())
+            sockets.append(sock)
+
+        def drain(seconds):
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                for key, _ in selector.select(0.2):
+                    try:
+                        key.data.extend(key.fileobj.recv(65536))
+                    except BlockingIOError:
+                        pass
+
+        def count(marker):
+            return sum(1 for sock in sockets if marker in selector.get_key(sock).data)
+
+        drain(3)
+        connected = count(b'retry: 3000')
+        connected_rss = rss_kb(server.pid)
+        urllib.request.urlopen(f'http://127.0.0.1:{args.port}/_bench/publish').read()
+        drain(5)
+        print(f'subscribers {args.subscribers}  connected {connected}  received {count(b"event: create")}  '
+              f'server RSS {base_rss / 1024:.1f}MB -> {connected_rss / 1024:.1f}MB  '
+              f'({(connected_rss - base_rss) / max(connected, 1):.1f}KB per connection)')
+        for sock in sockets:
+            sock.close()
+    finally:
+        server.kill()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Throughput and errors with several worker processes sharing one SQLite file.
+
+Starts --writers processes creating listings and --readers processes reading
+the feed for --duration seconds, each with its own app instance, like a
+multi-worker deployment. Compare STORAGE_MODE=production with the default:
+
+    python bench/bench_storage.py [--mode production] [--writers 4] [--readers 4] [--duration 10]
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import warnings
+
+from common import ROOT, load_app, percentile
+
+LISTING = {'title': 'Jars', 'description': 'Clean glass jars', 'location': 'Lyon',
+           'action': 'donate', 'material': 'glass'}
+
+
+def worker(workdir, kind, duration, results):
+    # Spawned children inherit DATABASE_URL and STORAGE_MODE from the parent
+    os.chdir(workdir)
+    sys.path.insert(0, ROOT)
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings('ignore')
+    import app as app_module
+    app_module.response_cache.backend.ttl = -1  # every read hits the database
+    client = app_module.app.test_client()
+    with app_module.app.app_context():
+        headers = {'Authorization': 'Bearer ' + app_module.create_access_token(identity='1')}
+
+    ok = errors = 0
+    durations = []
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        if kind == 'writers':
+            response = client.post('/listings', headers=headers, data=LISTING)
+        else:
+            response = client.get('/listings?limit=20')
+        durations.append(time.perf_counter() - start)
+        if response.status_code < 400:
+            ok += 1
+        else:
+            errors += 1
+    durations.sort()
+    results.put((kind, ok, errors, percentile(durations, 0.99)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', default='', help='STORAGE_MODE for the workers')
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+
+    app_module, workdir = load_app(STORAGE_MODE=args.mode)
+    with app_module.app.app_context():
+        app_module.db.session.add(app_module.User(id=1, username='bench', email='bench@example.com',
+                                                  password_hash='x'))
+        app_module.db.session.commit()
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    kinds = ['writers'] * args.writers + ['readers'] * args.readers
+    processes = [context.Process(target=worker, args=(workdir, kind, args.duration, results))
+                 for kind in kinds]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    for kind in ('writers', 'readers'):
+        rows = [report for report in reports if report[0] == kind]
+        if rows:
+            print(f'{args.mode or "default"} {kind}: {sum(row[1] for row in rows) / args.duration:.0f} ok/s  '
+                  f'errors {sum(row[2] for row in rows)}  '
+                  f'worst p99 {max(row[3] for row in rows) * 1000:.0f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Shared setup for the benchmark scripts in this directory."""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(**env):
+    """Import app.py against a fresh SQLite database in a temporary directory.
+
+    Extra keyword arguments are set as environment variables first (e.g.
+    STORAGE_MODE='production'). Returns (app module, working directory).
+    """
+    workdir = tempfile.mkdtemp(prefix='recyclehub-bench-')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    os.environ.update(env)
+    os.chdir(workdir)  # uploads/ is created relative to the working directory
+    sys.path.insert(0, ROOT)
+    import app
+    return app, workdir
+
+
+def timed(fn, repeat):
+    """Run fn `repeat` times; return the sorted durations in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return sorted(durations)
+
+
+def percentile(durations, fraction):
+    return durations[min(len(durations) - 1, int(len(durations) * fraction))]
+
+
+def median_ms(durations):
+    return statistics.median(durations) * 1000
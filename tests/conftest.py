@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+# Point the app at a throwaway database before it is imported (it upgrades the
+# schema on import), so tests never touch instance/recyclehub.db.
+TEST_DIR = tempfile.mkdtemp(prefix='recyclehub-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(TEST_DIR, 'test.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as recyclehub  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    yield recyclehub.app
+    with recyclehub.app.app_context():
+        recyclehub.db.session.query(recyclehub.Listing).delete()
+        recyclehub.db.session.query(recyclehub.User).delete()
+        recyclehub.db.session.commit()
+    recyclehub.response_cache.invalidate('')
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app):
+    with app.app_context():
+        user = recyclehub.User(username='alice', email='alice@example.com', password_hash='x')
+        recyclehub.db.session.add(user)
+        recyclehub.db.session.commit()
+        return user.id
+
+
+@pytest.fixture
+def auth_headers(app, user):
+    with app.app_context():
+        token = recyclehub.create_access_token(identity=str(user))
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def add_listings(app, user):
+    """Return a function that adds `count` listings owned by the user, one minute apart."""
+    def add(count):
+        start = datetime(2024, 1, 1)
+        with app.app_context():
+            for i in range(count):
+                recyclehub.db.session.add(recyclehub.Listing(
+                    id=str(uuid4()), title=f'Listing {i}', description='Clean glass jars',
+                    location='Lyon', action='donate', material='glass',
+                    image_filename=f'{i:064x}.jpg' if i % 2 else None,
+                    created_at=start + timedelta(minutes=i), user_id=user))
+            recyclehub.db.session.commit()
+        # Earlier pages must not be answered from the response cache
+        recyclehub.response_cache.invalidate('')
+    return add
@@ -0,0 +1,62 @@
+import app as recyclehub
+
+
+def listing_ids(app):
+    with app.app_context():
+        return [row.id for row in recyclehub.db.session.query(recyclehub.Listing.id)]
+
+
+def test_non_string_ids_are_reported_not_found(client, auth_headers):
+    response = client.post('/listings/batch', headers=auth_headers,
+                           json={'update': [{'id': [1]}], 'delete': [{'id': 'x'}]})
+    assert response.status_code == 200
+    assert [error['error'] for error in response.get_json()['errors']] == ['Listing not found'] * 2
+
+
+def test_updates_without_changes_are_not_reported_or_announced(app, client, auth_headers, add_listings):
+    add_listings(2)
+    unchanged, changed = listing_ids(app)
+    last_event = recyclehub.listing_events.last_id()
+
+    response = client.post('/listings/batch', headers=auth_headers, json={
+        'update': [{'id': unchanged}, {'id': changed, 'title': 'Blue jars'}]})
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == [changed]
+    events, _ = recyclehub.listing_events.read(last_event, timeout=0)
+    assert [(event['type'], event['data']['id']) for event in events] == [('update', changed)]
+
+
+def test_non_string_fields_are_rejected(app, client, auth_headers, add_listings):
+    add_listings(1)
+    [listing_id] = listing_ids(app)
+    create = {'title': {'x': 1}, 'description': 'Jars', 'location': 'Lyon', 'action': 'donate',
+              'material': True}
+    response = client.post('/listings/batch', headers=auth_headers, json={
+        'create': [create], 'update': [{'id': listing_id, 'title': ['Blue jars']}]})
+    body = response.get_json()
+    assert (body['created'], body['updated']) == ([], [])
+    assert body['errors'] == [
+        {'op': 'create', 'index': 0, 'error': 'Fields must be strings: title, material'},
+        {'op': 'update', 'index': 0, 'error': 'Fields must be strings: title'},
+    ]
+
+
+def test_repeated_deletes_are_applied_once(app, client, auth_headers, add_listings):
+    add_listings(1)
+    [listing_id] = listing_ids(app)
+    last_event = recyclehub.listing_events.last_id()
+    response = client.post('/listings/batch', headers=auth_headers,
+                           json={'delete': [listing_id, listing_id, 'missing']})
+    body = response.get_json()
+    assert body['deleted'] == [listing_id]
+    assert body['errors'] == [{'op': 'delete', 'index': 2, 'error': 'Listing not found'}]
+    events, _ = recyclehub.listing_events.read(last_event, timeout=0)
+    assert [event['type'] for event in events] == ['delete']
+
+
+def test_user_cursors_must_be_integers(client):
+    for cursor in ('W1sxXV0', 'WyIxIl0', 'W3RydWVd'):  # [[1]], ["1"], [true]
+        response = client.get(f'/users?cursor={cursor}')
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid cursor'}
+    assert client.get('/users?cursor=WzNd').status_code == 200  # [3]
@@ -0,0 +1,20 @@
+import app as recyclehub
+
+
+def test_unchanged_listings_answer_304(client):
+    first = client.get('/listings')
+    assert first.status_code == 200
+    again = client.get('/listings', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_response_built_before_invalidation_is_not_cached():
+    cache = recyclehub.ResponseCache(recyclehub.LRUCache(10, 60))
+    generation = cache.generation()
+    cache.invalidate('listings:')
+    cache.set('listings:stale', b'[]', generation)
+    assert cache.get('listings:stale') is None
+
+    cache.set('listings:fresh', b'[]', cache.generation())
+    assert cache.get('listings:fresh') is not None
+    assert (cache.hits, cache.misses) == (1, 1)
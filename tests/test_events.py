@@ -0,0 +1,60 @@
+import threading
+import time
+from itertools import islice
+
+import app as recyclehub
+
+
+def read_stream(client, last_event_id, chunks):
+    response = client.get('/listings/stream', headers={'Last-Event-ID': last_event_id}, buffered=False)
+    try:
+        return [chunk.decode() for chunk in islice(response.response, chunks)]
+    finally:
+        response.close()
+
+
+def publish(listing_id):
+    recyclehub.publish_listing_event('create', {'id': listing_id, 'material': 'Glass', 'action': 'donate'})
+
+
+def test_resume_replays_events_after_last_event_id(client):
+    start = recyclehub.listing_events.format_id(recyclehub.listing_events.last_id())
+    publish('a')
+    publish('b')
+    chunks = read_stream(client, start, 3)
+    assert chunks[0] == 'retry: 3000\n\n'
+    assert '"id": "a"' in chunks[1]
+    assert '"id": "b"' in chunks[2]
+    assert chunks[2].startswith(f'id: {recyclehub.listing_events.epoch}:')
+
+
+def test_ids_from_another_process_get_a_reset(client):
+    publish('a')
+    for foreign_id in ('0123abcd:1', '1', 'garbage'):
+        chunks = read_stream(client, foreign_id, 2)
+        current = recyclehub.listing_events.format_id(recyclehub.listing_events.last_id())
+        assert chunks[1] == f'id: {current}\nevent: reset\ndata: {{}}\n\n'
+
+
+def test_keep_alives_continue_while_unmatched_events_flow(client, monkeypatch):
+    monkeypatch.setitem(recyclehub.app.config, 'SSE_HEARTBEAT', 0.2)
+    stop = threading.Event()
+
+    def publish_unmatched():
+        deadline = time.monotonic() + 2
+        while not stop.wait(0.05) and time.monotonic() < deadline:
+            publish('glass')
+
+    publisher = threading.Thread(target=publish_unmatched)
+    publisher.start()
+    try:
+        response = client.get('/listings/stream?material=wood', buffered=False)
+        chunks = iter(response.response)
+        assert next(chunks) == b'retry: 3000\n\n'
+        started = time.monotonic()
+        assert next(chunks) == b': keep-alive\n\n'
+        assert time.monotonic() - started < 1
+        response.close()
+    finally:
+        stop.set()
+        publisher.join()
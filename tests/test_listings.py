@@ -0,0 +1,77 @@
+import base64
+import json
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import event
+
+import app as recyclehub
+
+
+def count_list_queries(app, client, url):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = recyclehub.db.engines['read']
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+def test_list_query_count_does_not_grow_with_rows(app, client, add_listings):
+    add_listings(3)
+    few_queries, few = count_list_queries(app, client, '/listings?limit=500')
+    assert len(few['listings']) == 3
+
+    add_listings(200)
+    many_queries, many = count_list_queries(app, client, '/listings?limit=500')
+    assert len(many['listings']) == 203
+    assert all(listing['username'] == 'alice' for listing in many['listings'])
+
+    assert few_queries == many_queries == 1
+
+
+def test_pages_follow_next_cursor(client, add_listings):
+    add_listings(7)
+    seen = []
+    cursor = None
+    while True:
+        url = '/listings?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url).get_json()
+        seen += [listing['title'] for listing in page['listings']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert seen == [f'Listing {i}' for i in reversed(range(7))]
+
+
+def encode(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def test_cursors_with_wrong_value_types_are_rejected(client):
+    for values in ([1, 'x'], [None, None], ['2024-01-01T00:00:00', [1]], ['2024-01-01T00:00:00', {'a': 1}]):
+        response = client.get('/listings?cursor=' + encode(values))
+        assert response.status_code == 400
+        assert response.get_json() == {'error': 'Invalid cursor'}
+    assert client.get('/listings?q=glass&cursor=' + encode(['1.5', '2024-01-01T00:00:00', 'x'])).status_code == 400
+
+
+def test_material_filter_matches_non_ascii_values(app, client, user):
+    with app.app_context():
+        recyclehub.db.session.add(recyclehub.Listing(
+            id=str(uuid4()), title='Bark', description='Dry bark', location='Lyon', action='donate',
+            material='Écorce', created_at=datetime(2024, 1, 1), user_id=user))
+        recyclehub.db.session.commit()
+    for material in ('Écorce', 'Éco', 'ÉCORCE'):
+        assert len(client.get(f'/listings?material={material}').get_json()['listings']) == 1
+    response = client.get('/listings?material=%F4%8F%BF%BF')  # U+10FFFF
+    assert response.status_code == 200
+    assert response.get_json()['listings'] == []
@@ -0,0 +1,61 @@
+import os
+import pstats
+import re
+
+import app as recyclehub
+
+
+def metric(client, name, endpoint):
+    text = client.get('/metrics').get_data(as_text=True)
+    match = re.search(rf'^{name}{{endpoint="{endpoint}",method="GET"}} (\S+)$', text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_streamed_response_bytes_are_counted(client, add_listings):
+    add_listings(5)
+    before = metric(client, 'recyclehub_response_bytes_total', 'get_listings')
+    response = client.get('/listings?format=ndjson')
+    body = response.get_data()
+    response.close()
+    assert response.mimetype == 'application/x-ndjson' and body
+    after = metric(client, 'recyclehub_response_bytes_total', 'get_listings')
+    assert after - before == len(body)
+
+
+def test_profiling_on_demand_requires_the_token(app, client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setitem(app.config, 'PROFILE_TOKEN', 'secret')
+    client.get('/listings', headers={'X-Profile': '1'}).close()
+    assert os.listdir(tmp_path) == []
+    client.get('/listings', headers={'X-Profile': 'secret'}).close()
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_streamed_profiles_cover_the_body(app, client, tmp_path, monkeypatch, add_listings):
+    add_listings(3)
+    monkeypatch.setitem(app.config, 'PROFILE_DIR', str(tmp_path))
+    monkeypatch.setitem(app.config, 'PROFILE_TOKEN', 'secret')
+    client.get('/listings?format=ndjson', headers={'X-Profile': 'secret'}).close()
+    [profile] = os.listdir(tmp_path)
+    functions = pstats.Stats(os.path.join(tmp_path, profile)).stats
+    assert any(name == 'stream_listings' for _, _, name in functions)
+
+
+def test_event_stream_is_not_in_the_latency_histogram(client):
+    response = client.get('/listings/stream', buffered=False)
+    response.close()
+    text = client.get('/metrics').get_data(as_text=True)
+    assert 'endpoint="stream_listing_events",method="GET",status="200"' in text
+    assert 'recyclehub_request_duration_seconds_count{endpoint="stream_listing_events"' not in text
+
+
+def test_failed_statements_leave_no_timing_state(app):
+    with app.app_context():
+        with recyclehub.db.engine.connect() as connection:
+            for _ in range(3):
+                try:
+                    connection.exec_driver_sql('SELECT * FROM no_such_table')
+                except Exception:
+                    connection.rollback()
+            assert connection.info == {}
+            connection.exec_driver_sql('SELECT 1')
@@ -0,0 +1,36 @@
+import os
+import signal
+
+import app as recyclehub
+
+
+def test_login_survives_a_killed_hashing_worker(client):
+    credentials = {'username': 'bob', 'password': 'correct horse'}
+    response = client.post('/signup', json={**credentials, 'email': 'bob@example.com'})
+    assert response.status_code in (200, 201)
+
+    pool = recyclehub.get_password_pool()
+    for process in list(pool._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+        process.join()
+
+    response = client.post('/login', json=credentials)
+    assert response.status_code == 200
+    assert 'access_token' in response.get_json()
+    assert recyclehub.get_password_pool() is not pool
+
+
+def test_concurrent_signup_for_the_same_user_is_rejected(client, monkeypatch):
+    # Another request creates the user while this one is hashing the password
+    def hash_password(password):
+        with recyclehub.app.app_context():
+            recyclehub.db.session.add(recyclehub.User(username='carol', email='carol@example.com',
+                                                      password_hash='x'))
+            recyclehub.db.session.commit()
+        return 'hash'
+
+    monkeypatch.setattr(recyclehub, 'hash_password', hash_password)
+    response = client.post('/signup', json={'username': 'carol', 'email': 'carol@example.com',
+                                            'password': 'pw'})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'User already exists'}
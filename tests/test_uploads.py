@@ -0,0 +1,91 @@
+import io
+import time
+
+import pytest
+from PIL import Image
+
+import app as recyclehub
+
+LISTING = {'title': 'Jars', 'description': 'Clean glass jars', 'location': 'Lyon',
+           'action': 'donate', 'material': 'glass'}
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    return tmp_path
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (2000, 1000), 'green').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def post_listing(client, auth_headers, content, filename='jars.png'):
+    response = client.post('/listings', headers=auth_headers,
+                           data={**LISTING, 'image': (io.BytesIO(content), filename)})
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def wait_for_thumbnails():
+    deadline = time.monotonic() + 10
+    while recyclehub.thumbnails_pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_identical_uploads_are_stored_once(client, auth_headers, upload_folder):
+    content = png_bytes()
+    first = post_listing(client, auth_headers, content)
+    second = post_listing(client, auth_headers, content, filename='copy.PNG')
+    assert first['image_url'] == second['image_url']
+    wait_for_thumbnails()
+    urls = [first['image_url']] + [first[f'{variant}_url'] for variant in recyclehub.IMAGE_VARIANTS]
+    assert sorted(path.name for path in upload_folder.iterdir()) == sorted(url.rsplit('/', 1)[1] for url in urls)
+
+
+def test_variant_urls_redirect_until_generated(client, auth_headers, upload_folder, monkeypatch):
+    schedule_variants = recyclehub.schedule_variants
+    monkeypatch.setattr(recyclehub, 'schedule_variants', lambda filename: None)
+    listing = post_listing(client, auth_headers, png_bytes())
+    original = listing['image_url'].rsplit('/', 1)[1]
+    thumbnail = listing['thumbnail_url'].rsplit('/', 1)[1]
+
+    response = client.get(f'/uploads/{thumbnail}')
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f'/uploads/{original}')
+
+    schedule_variants(original)
+    wait_for_thumbnails()
+    response = client.get(f'/uploads/{thumbnail}')
+    assert response.status_code == 200
+    assert max(Image.open(io.BytesIO(response.data)).size) == recyclehub.IMAGE_VARIANTS['thumbnail']
+
+    assert client.get(f"/uploads/{original.split('.')[0]}-huge.png").status_code == 404
+
+
+def test_stored_uploads_are_immutable_and_support_ranges(client, auth_headers, upload_folder):
+    content = png_bytes()
+    filename = post_listing(client, auth_headers, content)['image_url'].rsplit('/', 1)[1]
+    response = client.get(f'/uploads/{filename}')
+    assert response.status_code == 200
+    assert {'public', 'immutable', 'max-age=31536000'} <= set(
+        value.strip() for value in response.headers['Cache-Control'].split(','))
+
+    response = client.get(f'/uploads/{filename}', headers={'Range': 'bytes=0-99'})
+    assert response.status_code == 206
+    assert response.data == content[:100]
+
+
+def test_unreadable_images_are_not_queued_again(client, auth_headers, upload_folder, monkeypatch):
+    calls = []
+    generate_variants = recyclehub.generate_variants
+    monkeypatch.setattr(recyclehub, 'generate_variants',
+                        lambda filename: calls.append(filename) or generate_variants(filename))
+    listing = post_listing(client, auth_headers, b'not an image', filename='fake.jpg')
+    wait_for_thumbnails()
+    for _ in range(3):
+        assert client.get(listing['thumbnail_url']).status_code == 302
+        wait_for_thumbnails()
+    assert len(calls) == 1